@@ -7,17 +7,124 @@ PubMed 智能检索与导出工具
 本模块为医学文献智能分析服务提供底层数据抓取、解析与导出能力。
 """
 
+import io
 import os
+import gzip
 import time
 import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional, Any
-from Bio import Entrez
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from lxml import etree
 from dotenv import load_dotenv
 
 # 加载环境变量
 load_dotenv()
 
+# Entrez 自带限速（0.37 秒/次，有 API Key 时 0.1 秒/次）与重试，这里只配置其重试参数：
+# 最大尝试次数（含 HTTP 429 与 5xx）及网络错误后的等待秒数
+_ENTREZ_MAX_TRIES = 3
+_ENTREZ_SLEEP_BETWEEN_TRIES = 5
+# efetch 磁盘缓存有效期（秒）
+_CACHE_TTL = 24 * 3600
+
+
+# PubmedArticle 字段的 XPath，模块加载时编译一次；smart_strings=False 避免结果字符串持有对树的引用。
+# 路径均相对于已绑定的 MedlineCitation / Article / Journal / PubDate 节点
+_XP_TITLE = etree.XPath("ArticleTitle")
+_XP_AUTHORS = etree.XPath("AuthorList/Author")
+_XP_LAST_NAME = etree.XPath("string(LastName)", smart_strings=False)
+_XP_FORE_NAME = etree.XPath("string(ForeName)", smart_strings=False)
+_XP_INITIALS = etree.XPath("string(Initials)", smart_strings=False)
+_XP_COLLECTIVE_NAME = etree.XPath("string(CollectiveName)", smart_strings=False)
+_XP_JOURNAL = etree.XPath("string(Title)", smart_strings=False)
+_XP_PUB_YEAR = etree.XPath("string(Year)", smart_strings=False)
+_XP_PUB_MONTH = etree.XPath("string(Month)", smart_strings=False)
+_XP_PUB_DAY = etree.XPath("string(Day)", smart_strings=False)
+_XP_ABSTRACT = etree.XPath("Abstract/AbstractText")
+_XP_MESH = etree.XPath("MeshHeadingList/MeshHeading/DescriptorName/text()", smart_strings=False)
+_XP_KEYWORDS = etree.XPath("KeywordList/Keyword")
+_XP_PMID = etree.XPath("string(PMID)", smart_strings=False)
+_XP_DOI = etree.XPath("PubmedData/ArticleIdList/ArticleId[@IdType='doi']/text()", smart_strings=False)
+# 缺失节点的占位元素：对其求值的 XPath 一律返回空串/空列表，免去逐字段判空
+_EMPTY_ELEMENT = etree.Element("Empty")
+
+
+def _find_or_empty(node: "etree._Element", path: str) -> "etree._Element":
+    """查找子节点，不存在时返回空占位元素。"""
+    found = node.find(path)
+    return _EMPTY_ELEMENT if found is None else found
+
+
+def _markup_text(node: "etree._Element") -> str:
+    """
+    取节点文本，并按 Entrez.read 的方式原样保留 <i>/<sup> 等内联标签（实体已解码）。
+    """
+    parts = [node.text or ""]
+    for child in node:
+        parts.append(f"<{child.tag}>{_markup_text(child)}</{child.tag}>")
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+class _LRUCache:
+    """
+    线程安全的 LRU 缓存，超出容量时淘汰最久未使用的条目，超过有效期的条目视为未命中。
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        参数：
+            maxsize: 最大条目数
+            ttl: 条目有效期（秒）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """批量查询，返回未过期的命中键值对，并将命中条目标记为最近使用；过期条目直接删除。"""
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                stored_at, value = entry
+                if now - stored_at > self.ttl:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                found[key] = value
+        return found
+
+    def put(self, key: str, value: Any, age: float = 0.0) -> None:
+        """
+        写入条目并记录写入时间，必要时淘汰最久未使用的条目。
+        参数：
+            age: 条目数据已有的时长（秒），如来自磁盘缓存时为文件年龄，使其按数据的实际获取时间过期
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() - age, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# 按 PMID 缓存已解析的文章，不同检索命中相同文献时无需重复 efetch；与磁盘缓存同样 24 小时过期，进程内所有检索器共享
+_RECORD_CACHE = _LRUCache(maxsize=10000, ttl=_CACHE_TTL)
+
+# 本进程中已清理过的磁盘缓存目录；每个 MCP 工具调用都会新建 PubMedSearcher，清理只需在进程内做一次
+_PRUNED_CACHE_DIRS = set()
+_PRUNE_LOCK = threading.Lock()
+
+# 后台写磁盘缓存的单线程执行器：gzip 压缩与落盘不占用请求路径，单线程保证写入按提交顺序进行
+_CACHE_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pubmed-cache")
+
+
 class PubMedSearcher:
     """
     PubMed 检索与文章数据获取类，为智能分析服务提供底层数据支持。
@@ -29,15 +136,26 @@ class PubMedSearcher:
             email: 用户邮箱（NCBI 要求）
             api_key: NCBI API Key（可选，提升限速）
         """
+        # 延迟导入：Biopython 的 Entrez 模块加载较慢，仅在真正检索时才需要
+        from Bio import Entrez
         self.email = email
         self.api_key = api_key or os.getenv('NCBI_API_KEY')
         Entrez.email = self.email
         if self.api_key:
             Entrez.api_key = self.api_key
+        Entrez.max_tries = _ENTREZ_MAX_TRIES
+        Entrez.sleep_between_tries = _ENTREZ_SLEEP_BETWEEN_TRIES
         # 输出目录为项目根目录下的 output
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.output_dir = os.path.join(project_root, "output")
         os.makedirs(self.output_dir, exist_ok=True)
+        # efetch 结果缓存目录（按 PMID 存放 gzip 压缩的 PubmedArticle XML）
+        self._cache_dir = os.path.join(self.output_dir, ".cache")
+        os.makedirs(self._cache_dir, exist_ok=True)
+        with _PRUNE_LOCK:
+            if self._cache_dir not in _PRUNED_CACHE_DIRS:
+                _PRUNED_CACHE_DIRS.add(self._cache_dir)
+                self._prune_cache()
 
     def search(self, 
                advanced_search: str, 
@@ -65,174 +183,281 @@ class PubMedSearcher:
         try:
             if debug:
                 print(f"检索 PubMed，查询: {search_term}, 最大数: {max_results}, 排序: {sort}")
-            # 检索
-            if sort:
-                search_handle = Entrez.esearch(
-                    db="pubmed", term=search_term, retmax=max_results,
-                    sort=sort, usehistory="y"
-                )
-            else:
-                search_handle = Entrez.esearch(
-                    db="pubmed", term=search_term, retmax=max_results,
-                    usehistory="y"
-                )
-            search_results = Entrez.read(search_handle)
-            search_handle.close()
-            webenv = search_results["WebEnv"]
-            query_key = search_results["QueryKey"]
-            count = int(search_results["Count"])
-            if debug:
-                print(f"共找到 {count} 条结果，最多返回 {max_results} 条")
-            if count == 0:
+            pmids = self._esearch(search_term, max_results, sort, debug)
+            if not pmids:
                 if debug:
                     print("未找到结果")
                 return []
-            articles = []
-            # 分批获取，避免超时
-            batch_size = 100
-            for start in range(0, min(count, max_results), batch_size):
-                to_fetch = min(batch_size, max_results - start)
-                end = start + to_fetch
-                if debug:
-                    print(f"获取第 {start+1} 到 {end} 条记录")
-                try:
-                    fetch_handle = Entrez.efetch(
-                        db="pubmed",
-                        retstart=start,
-                        retmax=to_fetch,
-                        webenv=webenv,
-                        query_key=query_key,
-                        retmode="xml"
-                    )
-                    records = Entrez.read(fetch_handle)["PubmedArticle"]
-                    fetch_handle.close()
-                    for record in records:
-                        try:
-                            article = self._parse_pubmed_record(record)
-                            articles.append(article)
-                        except Exception as e:
-                            if debug:
-                                print(f"解析单条记录出错: {e}")
-                            continue
-                    time.sleep(1)  # 防止 NCBI 限流
-                except Exception as e:
-                    if debug:
-                        print(f"获取第 {start+1} 到 {end} 批次出错: {str(e)}")
-                    continue
-            return articles
+            return self._efetch_many(pmids, debug)
         except Exception as e:
             if debug:
                 print(f"PubMed 检索出错: {str(e)}")
             return []
 
-    def _parse_pubmed_record(self, record: Dict) -> Dict[str, Any]:
+    def _esearch(self, search_term: str, max_results: int, sort: Optional[str] = None,
+                 debug: bool = False) -> List[str]:
         """
-        解析 PubMed 记录为结构化字典。
+        执行 ESearch，返回按检索排序的 PMID 列表。
         参数：
-            record: Entrez.read 返回的 PubMed 记录
+            search_term: 完整检索式（已拼接日期范围）
+            max_results: 最大返回结果数
+            sort: 排序方式
+            debug: 是否打印调试信息
+        返回：
+            PMID 列表
+        """
+        from Bio import Entrez
+        params = {"db": "pubmed", "term": search_term, "retmax": max_results}
+        if sort:
+            params["sort"] = sort
+        # ESearch 结果同样交给 lxml 解析，不再经过 Entrez.read 构建 DictionaryElement
+        search_results = etree.fromstring(self._request(Entrez.esearch, **params))
+        error = search_results.findtext("ERROR")
+        if error:
+            raise RuntimeError(error)
+        if debug:
+            count = int(search_results.findtext("Count", "0"))
+            print(f"共找到 {count} 条结果，最多返回 {max_results} 条")
+        return [pmid.text for pmid in search_results.iterfind("IdList/Id")]
+
+    def _efetch_many(self, pmids: List[str], debug: bool = False) -> List[Dict[str, Any]]:
+        """
+        按 PMID 获取文章：依次查进程内 LRU 缓存、磁盘缓存，仍未命中的 PMID 合并为批量 efetch 请求。
+        参数：
+            pmids: PMID 列表
+            debug: 是否打印调试信息
+        返回：
+            文章字典列表，顺序与 pmids 一致
+        """
+        found = _RECORD_CACHE.get_many(pmids)
+        memory_hits = len(found)
+        missing = []
+        for pmid in pmids:
+            if pmid in found:
+                continue
+            cached = self._load_cached_article(pmid)
+            if cached is None:
+                missing.append(pmid)
+            else:
+                article, age = cached
+                found[pmid] = article
+                # 沿用磁盘缓存文件的年龄，两级缓存在同一时刻过期
+                _RECORD_CACHE.put(pmid, article, age=age)
+        if debug:
+            print(f"内存缓存命中 {memory_hits} 条，磁盘缓存命中 {len(found) - memory_hits} 条，需获取 {len(missing)} 条")
+        if missing:
+            # ESearch 最多返回 10000 个 PMID，恰为单次 efetch 上限，一次请求即可取回全部未命中记录
+            if debug:
+                print(f"获取 {len(missing)} 条记录")
+            try:
+                for article in self._parse_articles(self._fetch_batch(missing), debug, write_cache=True):
+                    pmid = article.get("pmid")
+                    if pmid:
+                        found[pmid] = article
+                        if "parse_error" not in article:
+                            _RECORD_CACHE.put(pmid, article)
+            except Exception as e:
+                if debug:
+                    print(f"获取记录出错: {str(e)}")
+        # 按检索排序输出
+        return [found[pmid] for pmid in pmids if pmid in found]
+
+    def _fetch_batch(self, pmids: List[str]) -> bytes:
+        """
+        获取一批 PMID 的 PubmedArticle XML 原始字节。
+        参数：
+            pmids: 本批次 PMID 列表
+        返回：
+            efetch 响应体
+        """
+        from Bio import Entrez
+        # PMID 较多时 Entrez.efetch 会自动改用 POST
+        return self._request(Entrez.efetch, db="pubmed", id=",".join(pmids), retmode="xml")
+
+    def _cache_path(self, pmid: str) -> str:
+        """单篇文章的磁盘缓存路径（按 PMID 存储，任意检索命中同一文献时均可复用）。"""
+        return os.path.join(self._cache_dir, f"{pmid}.xml.gz")
+
+    def _load_cached_article(self, pmid: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        从磁盘缓存读取并解析单篇文章，返回 (文章字典, 缓存文件年龄秒数)；未命中或已过期时返回 None。
+        """
+        cached = self._read_cache(self._cache_path(pmid))
+        if cached is None:
+            return None
+        data, age = cached
+        articles = self._parse_articles(data)
+        if not articles or "parse_error" in articles[0]:
+            return None
+        return articles[0], age
+
+    def _prune_cache(self) -> None:
+        """
+        删除缓存目录中超过有效期的文件（含异常中断遗留的临时文件），防止缓存无限增长。
+        """
+        expire_before = time.time() - _CACHE_TTL
+        with os.scandir(self._cache_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < expire_before:
+                        os.remove(entry.path)
+                except OSError:
+                    continue
+
+    @staticmethod
+    def _read_cache(cache_path: str) -> Optional[Tuple[bytes, float]]:
+        """
+        读取未过期的缓存文件，返回 (内容, 文件年龄秒数)；不存在、过期或损坏时返回 None，过期或损坏的文件顺带删除。
+        """
+        try:
+            age = max(0.0, time.time() - os.path.getmtime(cache_path))
+            if age > _CACHE_TTL:
+                os.remove(cache_path)
+                return None
+            with gzip.open(cache_path, "rb") as f:
+                return f.read(), age
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError):
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            return None
+
+    @staticmethod
+    def _write_cache(cache_path: str, data: bytes) -> None:
+        """
+        写入缓存文件；先写临时文件再原子替换，避免并发读到半截内容。
+        """
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def _write_cache_many(cls, items: List[Tuple[str, bytes]]) -> None:
+        """
+        在后台线程中依次写入多条缓存（缓存路径, XML 内容）；缓存只是加速手段，写入失败不影响检索结果。
+        """
+        for cache_path, data in items:
+            cls._write_cache(cache_path, data)
+
+    def _request(self, func: Callable[..., Any], **params: Any) -> bytes:
+        """
+        调用 Entrez E-utilities 并读取响应体；限速与重试由 Entrez 自身负责。
+        参数：
+            func: Entrez.esearch / Entrez.efetch 等
+            params: 请求参数
+        返回：
+            响应体
+        """
+        handle = func(**params)
+        try:
+            return handle.read()
+        finally:
+            handle.close()
+
+    def _parse_articles(self, data: bytes, debug: bool = False,
+                        write_cache: bool = False) -> List[Dict[str, Any]]:
+        """
+        流式解析 efetch 返回的 XML，逐篇处理 PubmedArticle，处理完立即释放已解析节点。
+        参数：
+            data: efetch 响应体
+            debug: 是否打印调试信息
+            write_cache: 是否将解析成功的 PubmedArticle 按 PMID 写入磁盘缓存
+        返回：
+            文章字典列表
+        """
+        articles = []
+        pending_writes = []
+        context = etree.iterparse(io.BytesIO(data), events=("end",), tag="PubmedArticle")
+        for _, elem in context:
+            try:
+                article = self._parse_pubmed_element(elem)
+                articles.append(article)
+                if write_cache and article.get("pmid") and "parse_error" not in article:
+                    # 节点随后即被清理，先序列化，解析结束后统一交给后台写入
+                    pending_writes.append((self._cache_path(article["pmid"]), etree.tostring(elem, with_tail=False)))
+            except Exception as e:
+                if debug:
+                    print(f"解析单条记录出错: {e}")
+            finally:
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        del context
+        if pending_writes:
+            _CACHE_WRITER.submit(self._write_cache_many, pending_writes)
+        return articles
+
+    def _parse_pubmed_element(self, elem: "etree._Element") -> Dict[str, Any]:
+        """
+        解析单个 PubmedArticle XML 元素为结构化字典。
+        参数：
+            elem: lxml iterparse 产出的 PubmedArticle 元素
         返回：
             结构化文章字典
         """
         article_data = {}
         try:
-            # 获取 MedlineCitation 和 Article
-            medline_citation = record.get("MedlineCitation", {})
-            article = medline_citation.get("Article", {})
-            # 标题
-            article_data["title"] = article.get("ArticleTitle", "")
-            # 作者（去重）
-            authors = set()
-            author_list = article.get("AuthorList", [])
-            for author in author_list:
-                if "LastName" in author and "ForeName" in author:
-                    authors.add(f"{author['LastName']} {author['ForeName']}")
-                elif "LastName" in author and "Initials" in author:
-                    authors.add(f"{author['LastName']} {author['Initials']}")
-                elif "LastName" in author:
-                    authors.add(author["LastName"])
-                elif "CollectiveName" in author:
-                    authors.add(author["CollectiveName"])
+            # 一次性绑定常用节点，后续字段均从最近的祖先节点开始查找
+            medline_citation = _find_or_empty(elem, "MedlineCitation")
+            article = _find_or_empty(medline_citation, "Article")
+            journal = _find_or_empty(article, "Journal")
+            pub_date = _find_or_empty(journal, "JournalIssue/PubDate")
+            # 标题（保留内联标签）
+            title = _XP_TITLE(article)
+            article_data["title"] = _markup_text(title[0]) if title else ""
+            # 作者（按署名顺序去重）
+            authors = {}
+            for author in _XP_AUTHORS(article):
+                last_name = _XP_LAST_NAME(author)
+                fore_name = _XP_FORE_NAME(author)
+                initials = _XP_INITIALS(author)
+                collective_name = _XP_COLLECTIVE_NAME(author)
+                if last_name and fore_name:
+                    authors[f"{last_name} {fore_name}"] = None
+                elif last_name and initials:
+                    authors[f"{last_name} {initials}"] = None
+                elif last_name:
+                    authors[last_name] = None
+                elif collective_name:
+                    authors[collective_name] = None
             article_data["authors"] = list(authors)
             # 期刊
-            journal = article.get("Journal", {})
-            article_data["journal"] = journal.get("Title", "")
+            article_data["journal"] = _XP_JOURNAL(journal)
             # 发表日期
-            pub_date = {}
-            journal_issue = journal.get("JournalIssue", {})
-            if "PubDate" in journal_issue:
-                pub_date = journal_issue["PubDate"]
-            pub_date_str = ""
-            if "Year" in pub_date:
-                pub_date_str = pub_date["Year"]
-                if "Month" in pub_date:
-                    pub_date_str += f" {pub_date['Month']}"
-                    if "Day" in pub_date:
-                        pub_date_str += f" {pub_date['Day']}"
+            pub_date_str = _XP_PUB_YEAR(pub_date)
+            if pub_date_str:
+                month = _XP_PUB_MONTH(pub_date)
+                if month:
+                    pub_date_str += f" {month}"
+                    day = _XP_PUB_DAY(pub_date)
+                    if day:
+                        pub_date_str += f" {day}"
             article_data["publication_date"] = pub_date_str
-            # 摘要
-            abstract_text = ""
-            if "Abstract" in article and "AbstractText" in article["Abstract"]:
-                abstract_parts = article["Abstract"]["AbstractText"]
-                if isinstance(abstract_parts, list):
-                    for part in abstract_parts:
-                        if isinstance(part, str):
-                            abstract_text += part + " "
-                        elif isinstance(part, dict) and "#text" in part:
-                            label = part.get("Label", "")
-                            text = part["#text"]
-                            if label:
-                                abstract_text += f"{label}: {text} "
-                            else:
-                                abstract_text += text + " "
-                else:
-                    abstract_text = str(abstract_parts)
-            article_data["abstract"] = abstract_text.strip()
-            # 关键词（去重）
-            keywords = set()
-            mesh_headings = medline_citation.get("MeshHeadingList", [])
-            for heading in mesh_headings:
-                if "DescriptorName" in heading:
-                    descriptor = heading["DescriptorName"]
-                    if isinstance(descriptor, dict) and "content" in descriptor:
-                        keywords.add(descriptor["content"])
-                    elif isinstance(descriptor, str):
-                        keywords.add(descriptor)
-            keyword_lists = medline_citation.get("KeywordList", [])
-            for keyword_list in keyword_lists:
-                if isinstance(keyword_list, list):
-                    for keyword in keyword_list:
-                        if isinstance(keyword, str):
-                            keywords.add(keyword)
-                        elif isinstance(keyword, dict) and "content" in keyword:
-                            keywords.add(keyword["content"])
+            # 摘要（结构化摘要各段直接拼接，不加 Label 前缀）
+            abstract_parts = [_markup_text(part) for part in _XP_ABSTRACT(article)]
+            article_data["abstract"] = " ".join(abstract_parts).strip()
+            # 关键词（MeSH 主题词 + 作者关键词，按出现顺序去重）
+            keywords = {}
+            for descriptor in _XP_MESH(medline_citation):
+                keywords[descriptor] = None
+            for keyword in _XP_KEYWORDS(medline_citation):
+                text = _markup_text(keyword)
+                if text:
+                    keywords[text] = None
             article_data["keywords"] = list(keywords)
             # PMID
-            pmid = medline_citation.get("PMID", "")
-            if isinstance(pmid, dict) and "content" in pmid:
-                article_data["pmid"] = pmid["content"]
-            else:
-                article_data["pmid"] = str(pmid)
+            article_data["pmid"] = _XP_PMID(medline_citation)
             # DOI
-            doi = ""
-            try:
-                pubmed_data = record.get("PubmedData")
-                if pubmed_data:
-                    article_id_list = pubmed_data.get("ArticleIdList")
-                    if article_id_list:
-                        try:
-                            for id_element in article_id_list:
-                                if hasattr(id_element, 'attributes') and id_element.attributes.get('IdType') == 'doi':
-                                    doi = str(id_element).strip()
-                                    if doi: break
-                                elif isinstance(id_element, dict) and id_element.get('IdType') == 'doi':
-                                    doi = id_element.get('content', '').strip() or id_element.get('#text', '').strip()
-                                    if doi: break
-                        except TypeError:
-                            if hasattr(article_id_list, 'attributes') and article_id_list.attributes.get('IdType') == 'doi':
-                                doi = str(article_id_list).strip()
-            except Exception as e:
-                doi = ""
-            article_data["doi"] = doi
+            doi = _XP_DOI(elem)
+            article_data["doi"] = doi[0].strip() if doi else ""
         except Exception as e:
             # 单条解析异常保护
             article_data["parse_error"] = str(e)
@@ -243,7 +468,7 @@ class PubMedSearcher:
         """
         对检索式做 hash，便于输出文件命名唯一化。
         """
-        return hashlib.sha1(query.encode("utf-8")).hexdigest()[:8]
+        return hashlib.blake2b(query.encode("utf-8"), digest_size=4).hexdigest()
 
     def export_to_txt(self, articles: List[Dict[str, Any]], query: Optional[str] = None, filename: Optional[str] = None) -> str:
         """
@@ -261,18 +486,25 @@ class PubMedSearcher:
             query_hash = self._hash_query(query or "") if query else "noquery"
             filename = f"pubmed_{date_str}_{query_hash}_{count}articles.txt"
         filepath = os.path.join(self.output_dir, filename)
+        # 先在内存中拼接全部内容，再一次性写入文件
+        div1 = "-" * 80 + "\n"
+        div2 = "=" * 80 + "\n\n"
+        parts = []
+        for i, article in enumerate(articles, 1):
+            parts.append(
+                f"Article {i}\n"
+                f"{div1}"
+                f"Title: {article.get('title', '')}\n"
+                f"Authors: {', '.join(article.get('authors', []))}\n"
+                f"Journal: {article.get('journal', '')}\n"
+                f"Publication Date: {article.get('publication_date', '')}\n"
+                f"Abstract:\n{article.get('abstract', '')}\n"
+                f"Keywords: {', '.join(article.get('keywords', []))}\n"
+                f"PMID: {article.get('pmid', '')}\n"
+                f"DOI: {article.get('doi', '')}\n"
+                f"{div2}"
+            )
         with open(filepath, 'w', encoding='utf-8') as f:
-            for i, article in enumerate(articles, 1):
-                f.write(f"Article {i}\n")
-                f.write("-" * 80 + "\n")
-                f.write(f"Title: {article.get('title', '')}\n")
-                f.write(f"Authors: {', '.join(article.get('authors', []))}\n")
-                f.write(f"Journal: {article.get('journal', '')}\n")
-                f.write(f"Publication Date: {article.get('publication_date', '')}\n")
-                f.write(f"Abstract:\n{article.get('abstract', '')}\n")
-                f.write(f"Keywords: {', '.join(article.get('keywords', []))}\n")
-                f.write(f"PMID: {article.get('pmid', '')}\n")
-                f.write(f"DOI: {article.get('doi', '')}\n")
-                f.write("=" * 80 + "\n\n")
+            f.write("".join(parts))
         print(f"已导出 {len(articles)} 篇文章到 {filepath}")
         return filepath
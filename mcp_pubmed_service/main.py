@@ -8,9 +8,14 @@
 """
 
 import os
+import re
 import sys
+import queue
+import atexit
 import logging
-from typing import Dict, List, Optional, Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterator, List, Optional, Any
+import orjson
 from dotenv import load_dotenv
 from datetime import datetime
 
@@ -19,7 +24,6 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 
 # 导入依赖模块
-import requests  # 用于调用 SiliconFlow API
 from mcp_pubmed_service.summary import extract_abstracts
 from mcp_pubmed_service.fetcher import PubMedSearcher
 from mcp.server.fastmcp import FastMCP
@@ -31,16 +35,31 @@ file_handler = logging.FileHandler(os.path.join(parent_dir, "insight.log"))
 file_handler.setFormatter(formatter)
 stream_handler = logging.StreamHandler()
 stream_handler.setFormatter(formatter)
+
+class _InProcessQueueHandler(QueueHandler):
+    """进程内队列无需序列化，原样传递日志记录，保留 exc_info 交给 JsonFormatter 处理。"""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+# 请求线程只负责入队，格式化与磁盘写入由后台 QueueListener 线程完成
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger("pubmed-mcp-server")
 logger.setLevel(logging.INFO)
-logger.addHandler(file_handler)
-logger.addHandler(stream_handler)
+logger.addHandler(_InProcessQueueHandler(log_queue))
 
 # 输出目录
 output_dir = os.path.join(parent_dir, "output")
 os.makedirs(output_dir, exist_ok=True)
 logger.info(f"输出目录: {output_dir}")
 
+def _list_output_files() -> set:
+    """一次 scandir 列出输出目录下的文件名，替代逐个文件 os.path.exists。"""
+    with os.scandir(output_dir) as entries:
+        return {entry.name for entry in entries if entry.is_file()}
+
 # 初始化 MCP 服务器
 mcp_server = FastMCP(
     "PubMed Analyzer",
@@ -52,6 +71,34 @@ load_dotenv()
 DEFAULT_EMAIL = os.getenv("NCBI_EMAIL")
 SILICONFLOW_API_KEY = os.getenv("SILICONFLOW_API_KEY")
 
+# SiliconFlow 连接池，首次调用 summarize_abstracts 时创建
+_siliconflow_session = None
+
+def _get_siliconflow_session():
+    """
+    获取到 SiliconFlow 的共享 Session：Keep-Alive 复用 TLS 连接，并对限流/网关错误自动重试。
+    requests 延迟到首次调用时导入，加快服务启动。
+    """
+    global _siliconflow_session
+    if _siliconflow_session is None:
+        import requests  # 用于调用 SiliconFlow API
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        # 仅重试连接失败与限流/网关状态码；读超时不重试，避免同一 POST 被重复生成并计费
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            status=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset({"POST"})
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+        _siliconflow_session = session
+    return _siliconflow_session
+
 @mcp_server.tool(name="fetch_articles", description="使用 PubMed 高级检索语法获取文章")
 def fetch_articles(
     query: str,
@@ -105,9 +152,9 @@ def summarize_abstracts(
     读取 results/ 目录下指定文件的摘要，调用 SilconFlow DeepSeek-V3 模型生成总结。
     """
     # 拼接结果文件的绝对路径并检查文件存在
-    filepaths = [os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "output", fn))
-                 for fn in filenames]
-    missing = [fp for fp in filepaths if not os.path.exists(fp)]
+    existing = _list_output_files()
+    filepaths = [os.path.join(output_dir, fn) for fn in filenames]
+    missing = [fp for fn, fp in zip(filenames, filepaths) if fn not in existing]
     if missing:
         return {"success": False, "status": "missing_files", "error": f"未找到文件: {missing}"}
 
@@ -116,7 +163,9 @@ def summarize_abstracts(
     if not raw_text:
         debug_info = {}
         try:
-            content = open(filepaths[0], encoding='utf-8').read()
+            # 诊断信息只需文件开头部分，限量读取即可
+            with open(filepaths[0], encoding='utf-8') as f:
+                content = f.read(65536)
             debug_info["has_abstract"] = "Abstract:" in content
             debug_info["has_keywords"] = "Keywords:" in content
             if debug_info["has_abstract"]:
@@ -161,16 +210,57 @@ def summarize_abstracts(
         "response_format": {"type": "text"}
     }
 
-    # 发起 HTTP 调用
+    # 发起 HTTP 调用，复用 Keep-Alive 连接
     try:
-        resp = requests.post(url, json=payload, headers=headers, timeout=120)
+        # orjson 直接产出 bytes，避免大段摘要文本经 stdlib json 编解码
+        resp = _get_siliconflow_session().post(url, data=orjson.dumps(payload), headers=headers, timeout=120)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         summary = data["choices"][0]["message"]["content"].strip()
         return {"success": True, "status": "summary_completed", "summary": summary}
     except Exception as e:
         return {"success": False, "status": "summary_failed", "error": str(e)}
 
+# 结果文件中的字段标签 → 引用字段名（按 export_to_txt 的写入顺序）
+_CITATION_FIELDS = {
+    "Title": "title",
+    "Authors": "authors",
+    "Journal": "journal",
+    "Publication Date": "pub_date",
+    "PMID": "pmid",
+    "DOI": "doi",
+}
+# 行首字段匹配：一次 C 层正则匹配代替逐个前缀 startswith
+_CITATION_LINE = re.compile(r"(%s):(.*)" % "|".join(map(re.escape, _CITATION_FIELDS)))
+# export_to_txt 写在每篇文章末尾的分隔线
+_RECORD_END = "=" * 80
+
+def _parse_citations(path: str) -> Iterator[Dict[str, str]]:
+    """
+    逐行扫描结果文件，遇到文章分隔线即产出一条字段字典，内存占用仅与单篇文章相关。
+    """
+    match_line = _CITATION_LINE.match
+    with open(path, encoding="utf-8") as f:
+        cur = {}
+        for line in f:
+            if line.startswith(_RECORD_END):
+                yield cur
+                cur = {}
+                continue
+            m = match_line(line)
+            if m:
+                cur[_CITATION_FIELDS[m.group(1)]] = m.group(2).strip()
+        # 兼容末尾缺少分隔线的文件
+        if cur:
+            yield cur
+
+def _format_citation(fields: Dict[str, str]) -> str:
+    """构造引用格式：作者 (年). 标题. 期刊. DOI; PMID"""
+    pub_date = fields.get("pub_date", "")
+    year = pub_date.split()[0] if pub_date else ""
+    return (f"{fields.get('authors', '')} ({year}). {fields.get('title', '')}. "
+            f"{fields.get('journal', '')}. DOI:{fields.get('doi', '')}; PMID:{fields.get('pmid', '')}")
+
 @mcp_server.tool()
 def format_citations(
     filenames: List[str]
@@ -179,34 +269,12 @@ def format_citations(
     格式化引用列表工具，将指定结果文件中的文章信息格式化为引用字符串列表。
     """
     citations = []
+    existing = _list_output_files()
     # 遍历每个结果文件
     for fn in filenames:
-        path = os.path.normpath(os.path.join(parent_dir, "output", fn))
-        if not os.path.exists(path):
+        if fn not in existing:
             return {"success": False, "status": "format_failed", "error": f"未找到文件: {fn}"}
-        content = open(path, encoding="utf-8").read()
-        # 按 Article 划分每篇文章块
-        blocks = [b for b in content.split("Article ") if b.strip()]
-        for block in blocks:
-            lines = block.splitlines()
-            title = authors = journal = pub_date = doi = pmid = ""
-            for line in lines:
-                if line.startswith("Title:"):
-                    title = line.replace("Title:", "").strip()
-                elif line.startswith("Authors:"):
-                    authors = line.replace("Authors:", "").strip()
-                elif line.startswith("Journal:"):
-                    journal = line.replace("Journal:", "").strip()
-                elif line.startswith("Publication Date:"):
-                    pub_date = line.replace("Publication Date:", "").strip()
-                elif line.startswith("DOI:"):
-                    doi = line.replace("DOI:", "").strip()
-                elif line.startswith("PMID:"):
-                    pmid = line.replace("PMID:", "").strip()
-            # 构造引用格式：作者 (年). 标题. 期刊. DOI; PMID
-            year = pub_date.split()[0] if pub_date else ""
-            cit = f"{authors} ({year}). {title}. {journal}. DOI:{doi}; PMID:{pmid}"
-            citations.append(cit)
+        citations.extend(_format_citation(fields) for fields in _parse_citations(os.path.join(output_dir, fn)))
     return {"success": True, "status": "citations_formatted", "citations": citations}
 
 def main():
@@ -1,25 +1,41 @@
-import re
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
+# 结果文件中摘要的起止标记（export_to_txt 的输出格式）
+_ABSTRACT_MARK = b"Abstract:"
+_KEYWORDS_MARK = b"Keywords:"
+_ABSTRACT_MARK_LEN = len(_ABSTRACT_MARK)
+
 def extract_abstracts_from_file(filepath: str) -> Optional[str]:
     """
     从单个结果文件中提取 Abstract 部分（不含标题/作者等）。
     """
-    text = open(filepath, encoding='utf-8').read()
-    # 找到"Abstract:"到下一个"Keywords:"之间的内容（跨行匹配）
-    m = re.search(r"Abstract:\s*(.+?)\s*Keywords:", text, flags=re.S)
-    if not m:
-        return None
+    with open(filepath, 'rb') as f:
+        # 空文件无法 mmap
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 找到"Abstract:"到下一个"Keywords:"之间的内容（跨行）
+            i = mm.find(_ABSTRACT_MARK)
+            if i < 0:
+                return None
+            i += _ABSTRACT_MARK_LEN
+            j = mm.find(_KEYWORDS_MARK, i)
+            if j < 0:
+                return None
+            abstract = mm[i:j]
     # 去掉多余空白
-    return m.group(1).strip()
+    return abstract.decode('utf-8').strip() or None
 
 def extract_abstracts(filepaths: List[str]) -> str:
     """
     将多篇文章的摘要按段合并，用于下游 LLM 汇总。
     """
-    abstracts = []
-    for fp in filepaths:
-        abs_txt = extract_abstracts_from_file(fp)
-        if abs_txt:
-            abstracts.append(abs_txt)
-    return "\n\n".join(abstracts)
+    if not filepaths:
+        return ""
+    # 各文件读取互不依赖，用线程重叠磁盘 I/O；map 保持输入顺序
+    with ThreadPoolExecutor(max_workers=min(8, len(filepaths))) as executor:
+        abstracts = list(executor.map(extract_abstracts_from_file, filepaths))
+    return "\n\n".join(abs_txt for abs_txt in abstracts if abs_txt)